@@ -1,22 +1,49 @@
 import hashlib
 import bisect
 import struct
-from collections import defaultdict
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, repeat
+from operator import ne
 
-# --- 1. HashFunction Module ---
-class HashFunction:
+# --- 1. Hash Module ---
+# Hashing is stateless, so it is plain functions rather than a class.
+# Every ring in this project places keys and vnodes with the functions below.
+# hashlib's OpenSSL backend picks its SHA-NI / SIMD SHA-1 code path for the
+# running CPU at load time, so no dispatch of our own is needed.
+
+_sha1 = hashlib.sha1
+# Unpacks the first 8 bytes of a digest as a big-endian unsigned long long
+_unpack_u64 = struct.Struct('>Q').unpack_from
+
+def hash_key(key: str) -> int:
     """
-    Handles deterministic hashing using SHA-1.
+    Returns a large integer hash for a given key string.
+    Using SHA-1 and taking the first 8 bytes implies a 64-bit keyspace.
     """
-    def hash(self, key: str) -> int:
-        """
-        Returns a large integer hash for a given key string.
-        Using SHA-1 and taking the first 8 bytes implies a 64-bit keyspace.
-        """
-        # Encode string to bytes, hash using SHA-1
-        hash_bytes = hashlib.sha1(key.encode('utf-8')).digest()
-        # Unpack first 8 bytes as a big-endian unsigned long long (0 -> 2^64 - 1)
-        return struct.unpack('>Q', hash_bytes[:8])[0]
+    return _unpack_u64(_sha1(key.encode('utf-8')).digest())[0]
+
+def hash_keys(keys) -> list:
+    """
+    Hashes a whole batch of keys in one call.
+    Returns the same values as hash_key(key) for each key, but binds the
+    hashing callables once instead of per key.
+    """
+    sha1 = _sha1
+    unpack = _unpack_u64
+    return [unpack(sha1(key.encode('utf-8')).digest())[0] for key in keys]
+
+def hash_vnode_keys(node: str, suffixes) -> list:
+    """
+    Hashes the virtual node keys of a node, e.g. "NodeA#0", "NodeA#1", ...
+    `suffixes` are the encoded replica numbers (b"0", b"1", ...); the "NodeA#"
+    prefix is encoded once and joined to each of them.
+    """
+    sha1 = _sha1
+    unpack = _unpack_u64
+    prefix = node.encode('utf-8') + b'#'
+    return [unpack(sha1(prefix + suffix).digest())[0] for suffix in suffixes]
 
 # --- 2. Node & HashRing Module ---
 class ConsistentHashRing:
@@ -29,23 +56,53 @@ class ConsistentHashRing:
                   Higher K = better load distribution.
         """
         self.replicas = replicas
-        self.hash_func = HashFunction()
-        self.ring = {}           # Map: hash_val -> physical_node_name
+        # Encoded vnode suffixes b"0", b"1", ... built once per ring
+        self._vnode_suffixes = [str(i).encode() for i in range(replicas)]
         self.sorted_keys = []    # Sorted list of hash values for O(log N) search
         self.nodes = set()       # Track physical nodes
+        # The ring is stored as parallel arrays (SoA) rather than a dict:
+        # _owners[i] is the node id owning sorted_keys[i], and node ids are
+        # small ints decoded through _node_name. Ids are never reused.
+        self._owners = array('H')
+        self._node_id = {}       # Map: physical_node_name -> node id
+        self._node_name = []     # Map: node id -> physical_node_name
+        # Owner name of each entry in sorted_keys, plus the owner of
+        # sorted_keys[0] appended so a bisect index of len(sorted_keys) wraps.
+        self._vnode_owners = []
+        self._vnode_ids = array('H')  # Same as _vnode_owners, as node ids
 
     def add_node(self, node: str):
         """
         Adds a physical node and its virtual nodes to the ring.
         """
-        self.nodes.add(node)
-        for i in range(self.replicas):
-            # Create a virtual node key, e.g., "NodeA#0", "NodeA#1"
-            vnode_key = f"{node}#{i}"
-            hash_val = self.hash_func.hash(vnode_key)
-            self.ring[hash_val] = node
-            # Insert into sorted list while maintaining order
-            bisect.insort(self.sorted_keys, hash_val)
+        self.add_nodes_bulk([node])
+
+    def add_nodes_bulk(self, nodes):
+        """
+        Adds several physical nodes at once.
+        All N*K vnode hashes are computed first and merged into the ring with
+        a single sort, instead of re-sorting the ring once per node.
+        """
+        new_hashes = []
+        new_owners = array('H')
+        for node in nodes:
+            self.nodes.add(node)
+            node_id = self._node_id.get(node)
+            if node_id is None:
+                node_id = len(self._node_name)
+                self._node_id[node] = node_id
+                self._node_name.append(node)
+            new_hashes += hash_vnode_keys(node, self._vnode_suffixes)
+            new_owners += array('H', [node_id]) * self.replicas
+        # Append the new vnodes, then argsort once and reorder both parallel
+        # arrays together. Timsort sees the existing sorted run plus the new
+        # tail, which is cheaper than one insort per vnode.
+        all_hashes = self.sorted_keys + new_hashes
+        all_owners = self._owners + new_owners
+        order = sorted(range(len(all_hashes)), key=all_hashes.__getitem__)
+        self.sorted_keys = list(map(all_hashes.__getitem__, order))
+        self._owners = array('H', map(all_owners.__getitem__, order))
+        self._refresh_owners()
 
     def remove_node(self, node: str):
         """
@@ -55,56 +112,247 @@ class ConsistentHashRing:
             return
         
         self.nodes.remove(node)
-        for i in range(self.replicas):
-            vnode_key = f"{node}#{i}"
-            hash_val = self.hash_func.hash(vnode_key)
-            # Remove from ring map
-            if hash_val in self.ring:
-                del self.ring[hash_val]
-            # Remove from sorted keys (O(N) operation in list, acceptable for infrequent config changes)
-            # Note: In production, a balanced BST or red-black tree is preferred for faster removal.
-            idx = bisect.bisect_left(self.sorted_keys, hash_val)
-            if idx < len(self.sorted_keys) and self.sorted_keys[idx] == hash_val:
-                self.sorted_keys.pop(idx)
+        # Drop every vnode owned by this node in one pass over the parallel
+        # arrays: O(N) in total, instead of one O(N) list pop per vnode.
+        keep = list(map(ne, self._owners, repeat(self._node_id[node])))
+        self.sorted_keys = list(compress(self.sorted_keys, keep))
+        self._owners = array('H', compress(self._owners, keep))
+        self._refresh_owners()
+
+    def _refresh_owners(self):
+        """
+        Rebuilds the vnode -> owner table used by the batch lookup.
+        Called after every topology change so lookups skip the id decoding.
+        """
+        owners = list(map(self._node_name.__getitem__, self._owners))
+        if owners:
+            owners.append(owners[0])
+        self._vnode_owners = owners
+        self._vnode_ids = self._owners + self._owners[:1]
 
     def get_node(self, key: str) -> str:
         """
         Given a key, find the responsible physical node.
         Time Complexity: O(log N) where N is total vnodes.
         """
-        if not self.ring:
+        return self.get_node_by_hash(hash_key(key))
+
+    def get_node_by_hash(self, hash_val: int) -> str:
+        """
+        Same as get_node, for a key whose hash is already known.
+        Lets callers that look up the same keys repeatedly hash them only once.
+        """
+        if not self.sorted_keys:
             return None
         
-        hash_val = self.hash_func.hash(key)
-        
         # Binary search for the first hash on the ring >= key's hash
         idx = bisect.bisect_left(self.sorted_keys, hash_val)
         
-        # If we reach the end of the list, wrap around to index 0 (Circular Ring)
-        if idx == len(self.sorted_keys):
-            idx = 0
-            
-        return self.ring[self.sorted_keys[idx]]
+        # If we reach the end of the list we wrap around to index 0 (Circular
+        # Ring): _vnode_owners repeats the first owner at index len(sorted_keys),
+        # so no bounds check is needed.
+        return self._vnode_owners[idx]
+
+    def get_nodes(self, keys) -> list:
+        """
+        Batch version of get_node: maps every key in `keys` to its node.
+        All keys are hashed up front via hash_keys.
+        """
+        return self.get_nodes_by_hashes(hash_keys(keys))
+
+    def get_nodes_by_hashes(self, hashes) -> list:
+        """
+        Batch version of get_node_by_hash. The binary searches and owner
+        lookups run as C-level map() loops with no per-key bytecode.
+        """
+        if not self.sorted_keys:
+            return [None] * len(hashes)
+
+        positions = map(bisect.bisect_left, repeat(self.sorted_keys), hashes)
+        return list(map(self._vnode_owners.__getitem__, positions))
+
+    def get_owners_by_hashes(self, hashes) -> array:
+        """
+        Like get_nodes_by_hashes, but returns a dense array('H') of node ids
+        (decode with get_node_name). Ids are stable across topology changes,
+        so two results can be compared position by position.
+        """
+        if not self.sorted_keys:
+            raise ValueError("cannot look up owners on an empty ring")
+
+        positions = map(bisect.bisect_left, repeat(self.sorted_keys), hashes)
+        return array('H', map(self._vnode_ids.__getitem__, positions))
+
+    def get_node_name(self, node_id: int) -> str:
+        """
+        Returns the physical node name for a node id.
+        """
+        return self._node_name[node_id]
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+def _mix64(z: int) -> int:
+    """
+    SplitMix64 finalizer: scrambles a 64-bit int into a well-spread 64-bit score.
+    """
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+class HRWHashRing:
+    """
+    Rendezvous (Highest Random Weight) hashing, an alternative to the vnode ring.
+    Each key goes to the node with the highest score mix(hash(key) ^ hash(node)).
+    There are no vnodes to hash or keep sorted, and adding a node only moves
+    the keys that node now wins (~1/N). Lookups cost O(N) in physical nodes,
+    so this suits small clusters. Exposes the same lookup API as
+    ConsistentHashRing.
+    """
+    def __init__(self):
+        self.nodes = set()       # Track physical nodes
+        self._node_id = {}       # Map: physical_node_name -> node id
+        self._node_name = []     # Map: node id -> physical_node_name (ids never reused)
+        self._seeds = []         # (node id, hash_key(node)) for every live node
+
+    def add_node(self, node: str):
+        """
+        Adds a physical node. Only its name hash is stored.
+        """
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        node_id = self._node_id.get(node)
+        if node_id is None:
+            node_id = len(self._node_name)
+            self._node_id[node] = node_id
+            self._node_name.append(node)
+        self._seeds.append((node_id, hash_key(node)))
+
+    def add_nodes_bulk(self, nodes):
+        """
+        Adds several physical nodes at once.
+        """
+        for node in nodes:
+            self.add_node(node)
+
+    def remove_node(self, node: str):
+        """
+        Removes a physical node; only the keys it owned move.
+        """
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        node_id = self._node_id[node]
+        self._seeds = [seed for seed in self._seeds if seed[0] != node_id]
+
+    def _owner_id(self, hash_val: int) -> int:
+        """
+        Returns the id of the highest-scoring node for a key hash.
+        """
+        best_id, best_score = -1, -1
+        for node_id, node_hash in self._seeds:
+            score = _mix64(hash_val ^ node_hash)
+            if score > best_score:
+                best_id, best_score = node_id, score
+        return best_id
+
+    def get_node(self, key: str) -> str:
+        """
+        Given a key, find the responsible physical node.
+        Time Complexity: O(N) where N is physical nodes.
+        """
+        return self.get_node_by_hash(hash_key(key))
+
+    def get_node_by_hash(self, hash_val: int) -> str:
+        """
+        Same as get_node, for a key whose hash is already known.
+        """
+        if not self._seeds:
+            return None
+        return self._node_name[self._owner_id(hash_val)]
+
+    def get_nodes(self, keys) -> list:
+        """
+        Batch version of get_node.
+        """
+        return self.get_nodes_by_hashes(hash_keys(keys))
+
+    def get_nodes_by_hashes(self, hashes) -> list:
+        """
+        Batch version of get_node_by_hash.
+        """
+        if not self._seeds:
+            return [None] * len(hashes)
+        return list(map(self._node_name.__getitem__, map(self._owner_id, hashes)))
+
+    def get_owners_by_hashes(self, hashes) -> array:
+        """
+        Returns a dense array('H') of stable node ids, one per hash
+        (see ConsistentHashRing.get_owners_by_hashes).
+        """
+        if not self._seeds:
+            raise ValueError("cannot look up owners on an empty ring")
+        return array('H', map(self._owner_id, hashes))
+
+    def get_node_name(self, node_id: int) -> str:
+        """
+        Returns the physical node name for a node id.
+        """
+        return self._node_name[node_id]
 
 # --- 3. Rebalancer / Evaluator Module ---
+# Key hashes of the current simulation, sent once to each pool worker
+_shard_key_hashes = []
+
+def _init_shard_worker(key_hashes):
+    global _shard_key_hashes
+    _shard_key_hashes = key_hashes
+
+def _owners_for_shard(ring, start, stop):
+    """
+    Runs in a pool worker: looks up owners for one slice of the key hashes.
+    """
+    return ring.get_owners_by_hashes(_shard_key_hashes[start:stop])
+
 class LoadBalancerSimulator:
     """
     Simulates key distribution and measures rebalancing efficiency.
     """
-    def __init__(self, num_keys=100000):
+    def __init__(self, num_keys=100000, workers=1):
+        """
+        workers: Processes used for the per-phase key lookups.
+                 1 keeps everything in-process.
+        """
         self.num_keys = num_keys
+        self.workers = workers
+        self._pool = None
         # Generate stable mock keys (Key0, Key1, ...)
         self.keys = [f"Key{i}" for i in range(num_keys)]
+        # Keys never change between phases, so hash them once up front
+        self.key_hashes = hash_keys(self.keys)
+
+    def get_owners(self, ring):
+        """
+        Maps every key to its node id on `ring` (see get_owners_by_hashes).
+        With a process pool the keys are split into one contiguous shard per
+        worker; each worker gets the (small) ring and returns its shard's owners.
+        """
+        if self._pool is None:
+            return ring.get_owners_by_hashes(self.key_hashes)
+
+        shard_size = -(-self.num_keys // self.workers)  # ceil division
+        starts = range(0, self.num_keys, shard_size)
+        stops = [start + shard_size for start in starts]
+        owners = array('H')
+        for shard in self._pool.map(_owners_for_shard, repeat(ring), starts, stops):
+            owners += shard
+        return owners
 
     def get_distribution(self, ring):
         """
         Calculates how many keys are mapped to each node.
         """
-        distribution = defaultdict(int)
-        for key in self.keys:
-            node = ring.get_node(key)
-            distribution[node] += 1
-        return distribution
+        return Counter(ring.get_nodes_by_hashes(self.key_hashes))
 
     def calculate_diff(self, dist_before, dist_after):
         """
@@ -115,45 +363,49 @@ class LoadBalancerSimulator:
         pass # Helper only, actual logic in run_simulation
 
     def run_scenario(self):
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_init_shard_worker,
+                                             initargs=(self.key_hashes,))
+        try:
+            self._run_scenario()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _run_scenario(self):
         print("--- Consistent Hashing Simulation ---")
         
         # 1. Setup Initial Ring
         ring = ConsistentHashRing(replicas=100) # K=100 vnodes
         initial_nodes = ["Node_A", "Node_B", "Node_C"]
-        for n in initial_nodes:
-            ring.add_node(n)
+        ring.add_nodes_bulk(initial_nodes)
         
         print(f"1. Initial State: {len(initial_nodes)} Nodes, {ring.replicas} vnodes/node")
         
         # 2. Measure Initial Load
-        mapping_before = {}
-        dist_before = defaultdict(int)
-        for key in self.keys:
-            node = ring.get_node(key)
-            mapping_before[key] = node
-            dist_before[node] += 1
+        # Ownership is a dense array of node ids indexed by key position
+        owners_before = self.get_owners(ring)
+        dist_before = Counter(owners_before)
             
         # Print Stats
         print(f"   Total Keys: {self.num_keys}")
         print("   Load Distribution:")
-        for node, count in dist_before.items():
-            print(f"     {node}: {count} keys ({count/self.num_keys:.2%})")
+        for node_id, count in dist_before.items():
+            print(f"     {ring.get_node_name(node_id)}: {count} keys ({count/self.num_keys:.2%})")
 
         # 3. Add a Node (Node_D)
         print("\n2. Adding Node_D...")
         ring.add_node("Node_D")
         
-        moved_keys = 0
-        dist_after_add = defaultdict(int)
-        for key in self.keys:
-            new_node = ring.get_node(key)
-            dist_after_add[new_node] += 1
-            if new_node != mapping_before[key]:
-                moved_keys += 1
+        owners_after_add = self.get_owners(ring)
+        dist_after_add = Counter(owners_after_add)
+        moved_keys = sum(map(ne, owners_after_add, owners_before))
                 
         print("   Load Distribution After Add:")
-        for node, count in dist_after_add.items():
-            print(f"     {node}: {count} keys ({count/self.num_keys:.2%})")
+        for node_id, count in dist_after_add.items():
+            print(f"     {ring.get_node_name(node_id)}: {count} keys ({count/self.num_keys:.2%})")
             
         percent_moved = moved_keys / self.num_keys
         ideal_movement = 1.0 / (len(initial_nodes) + 1) # 1/(N+1)
@@ -162,24 +414,17 @@ class LoadBalancerSimulator:
 
         # 4. Remove a Node (Node_A)
         print("\n3. Removing Node_A...")
-        # Update mapping baseline to current state (with D included)
-        mapping_before_remove = {}
-        for key in self.keys:
-            mapping_before_remove[key] = ring.get_node(key)
-            
+        # The post-add ownership (with D included) is the baseline; the
+        # ring has not changed since, so there is no need to look keys up again
         ring.remove_node("Node_A")
         
-        moved_keys_rem = 0
-        dist_after_rem = defaultdict(int)
-        for key in self.keys:
-            new_node = ring.get_node(key)
-            dist_after_rem[new_node] += 1
-            if new_node != mapping_before_remove[key]:
-                moved_keys_rem += 1
+        owners_after_rem = self.get_owners(ring)
+        dist_after_rem = Counter(owners_after_rem)
+        moved_keys_rem = sum(map(ne, owners_after_rem, owners_after_add))
 
         print("   Load Distribution After Removal:")
-        for node, count in dist_after_rem.items():
-            print(f"     {node}: {count} keys ({count/self.num_keys:.2%})")
+        for node_id, count in dist_after_rem.items():
+            print(f"     {ring.get_node_name(node_id)}: {count} keys ({count/self.num_keys:.2%})")
             
         print(f"   Keys Moved: {moved_keys_rem} ({moved_keys_rem/self.num_keys:.2%})")
 
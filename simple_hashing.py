@@ -1,5 +1,6 @@
 import bisect #sorted ring
-import hashlib #hash generator
+from itertools import repeat
+from consistent_hashing import hash_key, hash_keys, hash_vnode_keys #shared SHA-1 hash generator
 
 class ConsistentHashRing:
     def __init__(self, num_virtual_nodes=100):
@@ -7,9 +8,11 @@ class ConsistentHashRing:
         self.ring = {} #empty dictionary hash_position → node_name
         self.sorted_keys = [] # sorted list
         self.nodes = set() #Stores physical nodes
+        self._suffixes = [str(i).encode() for i in range(num_virtual_nodes)] #b"0", b"1", ...
+        self._node_positions = {} #node_name → its vnode positions, so removal skips re-hashing
         
     def _hash(self, key):
-        return int(hashlib.md5(key.encode()).hexdigest(),16)
+        return hash_key(key) #same 64-bit SHA-1 positions as consistent_hashing
     
     def add_node(self, node_name):
         if node_name in self.nodes:
@@ -17,13 +20,12 @@ class ConsistentHashRing:
         
         self.nodes.add(node_name)
         
-        for i in range(self.num_virtual_nodes):
-            virtual_key = f"{node_name}#{i}"
-            
-            position = self._hash(virtual_key)
-            
-            self.ring[position] = node_name
-            bisect.insort(self.sorted_keys, position)
+        positions = hash_vnode_keys(node_name, self._suffixes) #"Node#0", "Node#1", ...
+        
+        self._node_positions[node_name] = positions
+        self.ring.update(zip(positions, [node_name] * self.num_virtual_nodes))
+        self.sorted_keys.extend(positions)
+        self.sorted_keys.sort() #single sort instead of one insort per vnode
             
     def get_node(self, key):
         if not self.ring:
@@ -40,6 +42,19 @@ class ConsistentHashRing:
         
         return self.ring[node_position]
     
+    def get_nodes(self, keys):
+        #batch get_node: hashing, bisect and lookup all run as C-level map loops
+        if not self.ring:
+            return [None] * len(keys)
+        
+        owners = [self.ring[position] for position in self.sorted_keys]
+        owners.append(owners[0]) #index len(sorted_keys) wraps to the first vnode
+        
+        key_positions = hash_keys(keys)
+        idxs = map(bisect.bisect_right, repeat(self.sorted_keys), key_positions)
+        
+        return list(map(owners.__getitem__, idxs))
+    
     def remove_node(self, node_name):
         
         if node_name not in self.nodes:
@@ -47,17 +62,14 @@ class ConsistentHashRing:
         
         self.nodes.remove(node_name)
         
-        for i in range(self.num_virtual_nodes):
-            virtual_key = f"{node_name}#{i}"
-            position = self._hash(virtual_key)
-            
-            if position in self.ring:
-                del self.ring[position]
-                
-            idx = bisect.bisect_left(self.sorted_keys, position)
+        positions = self._node_positions.pop(node_name)
+        
+        for position in positions:
+            self.ring.pop(position, None)
             
-            if idx < len(self.sorted_keys) and self.sorted_keys[idx] == position:
-                self.sorted_keys.pop(idx)
+        removed = set(positions)
+        #one pass over the ring instead of a bisect + O(N) pop per vnode
+        self.sorted_keys = [p for p in self.sorted_keys if p not in removed]
                 
             
 class StorageService:
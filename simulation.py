@@ -1,6 +1,7 @@
 import random
 import statistics
 import collections
+from operator import ne
 from simple_hashing import ConsistentHashRing  # Assuming your class is in consistent_hash.py
 
 def measure_distribution(ring, num_keys=10000):
@@ -8,20 +9,12 @@ def measure_distribution(ring, num_keys=10000):
     Generates 'num_keys' random strings and assigns them to nodes.
     Returns: A dictionary of {NodeName: KeyCount}
     """
-    node_counts = collections.defaultdict(int)
+    # 1. Generate random keys (e.g., "user_84920")
+    keys = [f"user_{random.randint(0, 1_000_000)}" for _ in range(num_keys)]
     
-    # 1. Generate random keys and assign them
-    for i in range(num_keys):
-        # Create a random key (e.g., "user_84920")
-        key = f"user_{random.randint(0, 1_000_000)}"
-        
-        # 2. Ask the ring: "Who owns this?"
-        assigned_node = ring.get_node(key)
-        
-        # 3. Count it
-        node_counts[assigned_node] += 1
-    
-    return node_counts
+    # 2. Ask the ring: "Who owns these?" (one batch call for all keys)
+    # 3. Count them (Counter tallies in C, no per-key dict updates in Python)
+    return collections.Counter(ring.get_nodes(keys))
 
 def print_stats(counts):
     """
@@ -59,23 +52,18 @@ if __name__ == "__main__":
     # 1. Track where a specific set of keys is right now
     # We use a fixed set of keys to track movement precisely
     test_keys = [f"key_{i}" for i in range(KEYS_TO_TEST)]
-    initial_assignment = {}
-    for k in test_keys:
-        initial_assignment[k] = ring.get_node(k)
+    # Keys are positional, so the assignment is just a list aligned with test_keys
+    initial_assignment = ring.get_nodes(test_keys)
         
     # 2. Add a NEW Node
     print(">>> Adding 'Node_F'...")
     ring.add_node("Node_F")
     
     # 3. Check where the keys are now
-    moved_keys = 0
-    new_counts = collections.defaultdict(int)
+    new_assignment = ring.get_nodes(test_keys)
+    new_counts = collections.Counter(new_assignment)
     
-    for k in test_keys:
-        new_node = ring.get_node(k)
-        new_counts[new_node] += 1
-        if new_node != initial_assignment[k]:
-            moved_keys += 1
+    moved_keys = sum(map(ne, new_assignment, initial_assignment))
             
     print(f"  - Total Keys: {KEYS_TO_TEST}")
     print(f"  - Keys Moved: {moved_keys}")